@@ -30,21 +30,29 @@ import sublime_plugin
 
 import collections
 import threading
+import weakref
+
+from functools import partial
 
 from ..api import deviot
 from .tools import findInOpendView, get_setting
 from .I18n import I18n
 
-session = {}
+# panels by name, entries are dropped when the instance is collected
+session = weakref.WeakValueDictionary()
 close_panel = False
 viewer_name = 'Deviot Viewer'
 
+# seconds the pump thread waits for new text before finishing
+_PUMP_IDLE = 1
+
+# syntax of the console, the plugin name doesn't change at runtime
+_SYNTAX = "Packages/{0}/Console.tmLanguage".format(deviot.plugin_name())
+
 
 class Messages:
     port = None
     window = None
-    text_queue = collections.deque()
-    text_queue_lock = threading.Lock()
 
     def __init__(self, output_view=None):
         self.translate = I18n().translate
@@ -52,6 +60,11 @@ class Messages:
         self._init_text = None
         self._name = None
 
+        self.text_queue = collections.deque()
+        self._wake = threading.Event()
+        self._pump_thread = None
+        self._pump_lock = threading.Lock()
+
     def initial_text(self, text, *args):
         """Intial message
 
@@ -116,11 +129,8 @@ class Messages:
         if(in_file):
             self.output_view = self.new_file_panel(direction)
         else:
-            package_name = deviot.plugin_name()
-            syntax = "Packages/{0}/Console.tmLanguage".format(package_name)
-
             self.output_view = self.window.create_output_panel('deviot')
-            self.output_view.assign_syntax(syntax)
+            self.output_view.assign_syntax(_SYNTAX)
         self.output_view.set_read_only(True)
 
     def set_focus(self):
@@ -136,39 +146,71 @@ class Messages:
         Adds the string in the deque list
         """
         # translate strings before append
-        text = I18n().translate(text, *args)
+        text = self.translate(text, *args)
 
-        self.text_queue_lock.acquire()
-        try:
-            if(type(text) == bytes):
-                text = text.decode('utf-8')
-            self.text_queue.append(text)
-        finally:
-            self.text_queue_lock.release()
+        if(type(text) == bytes):
+            text = text.decode('utf-8')
 
-        sublime.set_timeout(self.service_text_queue, 0)
+        # normalize end of lines before the messages are joined
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
 
-    def service_text_queue(self):
-        """
-        Handles the deque list to print the messages
-        """
-        self.text_queue_lock.acquire()
+        # fix only end of lines
+        if('\\n' in text[-2:]):
+            text = text.replace('\\n', '\n')
 
-        is_empty = False
-        try:
-            if(len(self.text_queue) == 0):
-                return
+        # deque.append is atomic, no lock needed with a single consumer
+        self.text_queue.append(text)
+        self._wake.set()
 
-            characters = self.text_queue.popleft()
-            is_empty = (len(self.text_queue) == 0)
+        if(self._pump_thread is None):
+            self._start_pump()
 
-            self.send_to_file(characters)
+    def _start_pump(self):
+        """Start pump
 
-        finally:
-            self.text_queue_lock.release()
+        Starts the background thread in charge to print the queued strings,
+        only if it isn't already running
+        """
+        with self._pump_lock:
+            if(self._pump_thread is not None):
+                return
+
+            self._pump_thread = threading.Thread(target=self._pump)
+            self._pump_thread.daemon = True
+            self._pump_thread.start()
 
-        if(not is_empty):
-            sublime.set_timeout(self.service_text_queue, 1)
+    def _pump(self):
+        """Text pump
+
+        Waits for new strings in the deque list, all the pending strings are
+        joined and printed at once in the main thread. The thread finishes
+        when there is no new text after _PUMP_IDLE seconds
+        """
+        while True:
+            if(not self._wake.wait(_PUMP_IDLE)):
+                with self._pump_lock:
+                    if(not self.text_queue):
+                        self._pump_thread = None
+                        break
+
+            self._wake.clear()
+
+            batch = []
+            try:
+                while True:
+                    batch.append(self.text_queue.popleft())
+            except IndexError:
+                pass
+
+            # a batch can hold thousands of lines, send_to_file scrolls to
+            # the end of the appended text not to the start of the batch
+            if(batch):
+                sublime.set_timeout(
+                    partial(self.send_to_file, ''.join(batch)), 0)
+
+        # text appended while the thread was finishing
+        if(self.text_queue):
+            self._start_pump()
 
     def send_to_file(self, text):
         """
@@ -182,13 +224,6 @@ class Messages:
         if(auto_clean and size > 80 * 20000):  # 20000 lines of 80 charactes
             self.clean_view()
 
-        # append text
-        text = text.replace('\r\n', '\n'). replace('\r', '\n')
-
-        # fix only end of lines
-        if('\\n' in text[-2:]):
-            text = text.replace('\\n', '\n')
-
         self.output_view.run_command('append', {
                                      'characters': text, "force": True})
 
@@ -197,7 +232,9 @@ class Messages:
         if(len(self.output_view.sel()) > 0 and
            automatic_scroll or not self._name):
 
-            line = self.output_view.rowcol(size)[0] + 1
+            # several messages can be appended at once, go to the last line
+            end = self.output_view.size()
+            line = self.output_view.rowcol(end)[0] + 1
             self.output_view.run_command("goto_line", {"line": line})
 
     def clean_view(self):
@@ -272,12 +309,13 @@ class Messages:
         self.window = view.window()
 
     def on_close(self, view):
-        if(view.name() not in session):
+        msgs = session.pop(view.name(), None)
+        if(msgs is None):
             return
 
-        if(check_empty_panel(self.window)):
-            close_panel(self.window)
-            self.window = None
+        if(check_empty_panel(msgs.window)):
+            close_panel(msgs.window)
+            msgs.window = None
 
 
 def check_empty_panel(window):
@@ -287,9 +325,7 @@ def check_empty_panel(window):
     Returns:
         bool -- True if there is an empty panel false if not
     """
-    num = window.num_groups()
-
-    for n in range(0, num):
+    for n in range(window.num_groups()):
         if(not window.views_in_group(n)):
             window.focus_group(n)
             return True
@@ -6,8 +6,9 @@ from __future__ import print_function
 from __future__ import division
 from __future__ import unicode_literals
 
-from os import path
-from .tools import accepted_extensions, get_setting
+from os import path, sep
+from shutil import move
+from .tools import accepted_extensions, get_setting, save_setting
 from ..libraries.readconfig import ReadConfig
 from ..platformio.project_recognition import ProjectRecognition
 from .quick_menu import QuickMenu
@@ -16,6 +17,9 @@ from ..api import deviot
 
 logger = deviot.create_logger('Deviot')
 
+# extensions considered as IOT files, built once at import
+_IOT_EXTS = frozenset(accepted_extensions())
+
 
 class ProjectCheck(QuickMenu):
     """
@@ -43,12 +47,7 @@ class ProjectCheck(QuickMenu):
         Returns:
             bool -- true if is in the list false if not
         """
-        ext = self.get_file_extension()
-        accepted = accepted_extensions()
-
-        if(ext not in accepted):
-            return False
-        return True
+        return self.get_file_extension() in _IOT_EXTS
 
     def is_empty(self):
         """Empty File
@@ -58,11 +57,7 @@ class ProjectCheck(QuickMenu):
         Returns:
             bool -- true is if empty
         """
-        size = self.view.size()
-
-        if(size > 0):
-            return False
-        return True
+        return self.view.size() <= 0
 
     def is_unsaved(self):
         """Unsaved View
@@ -150,11 +145,9 @@ class ProjectCheck(QuickMenu):
             file_path = self.get_file_path()
 
             dst = add_folder_to_filepath(file_path, 'src')
+            parts = path.normpath(file_path).split(sep)
 
-            if('src' not in file_path and not path.exists(dst)):
-                from shutil import move
-                from .tools import get_setting, save_setting
-
+            if('src' not in parts and not path.exists(dst)):
                 move(file_path, dst)
                 self.view.retarget(dst)
 
@@ -183,6 +176,8 @@ class ProjectCheck(QuickMenu):
         project_path = self.get_project_path()
         ini_path = self.get_ini_path()
 
+        # parsed on every call, platformio.ini can be rewritten by other
+        # commands right before this one runs
         config = ReadConfig()
         config.read(ini_path)
 